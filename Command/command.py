@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from TaskManager.taskManager import *
+from TaskStorePool.taskStorePool import *
 from Validation.validation import *
 
 class Command(ABC):
@@ -174,19 +175,88 @@ class EditTaskCommand(Command):
             due_date = get_valid_date(f"Новый срок выполнения (текущий: {task.due_date}, формат: YYYY-MM-DD): ")
             priority = get_valid_priority(f"Новый приоритет (текущий: {task.priority}, варианты: низкий/средний/высокий): ")
 
-            task.title = title
-            task.description = description
-            task.category = category
-            task.due_date = due_date or task.due_date
-            task.priority = priority or task.priority
-            self.manager.save_tasks()
+            self.manager.update_task(
+                task.id,
+                title=title,
+                description=description,
+                category=category,
+                due_date=due_date or task.due_date,
+                priority=priority or task.priority
+            )
 
             print("Задача успешно отредактирована.")
 
         except Exception as e:
             print(f"Ошибка: ID не существует")
 
+class StatsCommand(Command):
+    """Команда для просмотра статистики по задачам."""
+    def __init__(self, manager: TaskManager):
+        """Инициализация команды с менеджером задач.
+
+        :param manager: Менеджер задач, который управляет задачами.
+        """
+        self.manager = manager
+
+    def execute(self):
+        """Выводит сводную статистику по задачам.
+
+        Показывает общее число задач, распределение по категориям, приоритетам и статусам,
+        число просроченных задач и процент выполненных задач.
+        """
+        stats = self.manager.stats()
+        print(f"Всего задач: {stats['total']}")
+        for title, key in (("По категориям", "by_category"), ("По приоритетам", "by_priority"), ("По статусам", "by_status")):
+            print(f"{title}:")
+            for name, count in stats[key].items():
+                print(f"  {name}: {count}")
+        print(f"Просрочено: {stats['overdue']}")
+        print(f"Выполнено: {stats['completion_rate']:.0%}")
+
+class SwitchStoreCommand(Command):
+    """Команда для смены активного хранилища задач."""
+    def __init__(self, pool: TaskStorePool, on_switch: Callable[[TaskManager], None]):
+        """Инициализация команды с пулом хранилищ.
+
+        :param pool: Пул открытых хранилищ задач.
+        :param on_switch: Функция, которой передается новый активный менеджер задач.
+        """
+        self.pool = pool
+        self.on_switch = on_switch
+
+    def execute(self):
+        """Переключает активное хранилище.
+
+        Запрашивает у пользователя путь к файлу задач и делает его активным. Недавно использованные
+        хранилища берутся из пула без повторного чтения файла.
+        """
+        storage_file = get_input("Файл задач: ", "Ошибка: Путь к файлу не может быть пустым")
+        try:
+            manager = self.pool.get(storage_file)
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Ошибка: не удалось открыть хранилище: {e}")
+            return
+        self.on_switch(manager)
+        print(f"Активное хранилище: {storage_file}")
+
 class ExitCommand(Command):
     """Команда для выхода из программы."""
+    def __init__(self, pool: Optional[TaskStorePool] = None):
+        """Инициализация команды с пулом хранилищ.
+
+        :param pool: Пул хранилищ, несохраненные изменения которого записываются перед выходом.
+        """
+        self.pool = pool
+
     def execute(self):
+        """Сохраняет изменения во всех открытых хранилищах и завершает программу.
+
+        Если изменения некоторых хранилищ нельзя сохранить из-за внешнего изменения файлов,
+        выводится сообщение об ошибке, а файлы остаются без изменений.
+        """
+        if self.pool:
+            try:
+                self.pool.close()
+            except ValueError as e:
+                print(f"Ошибка: изменения не сохранены: {e}")
         exit()
@@ -0,0 +1,346 @@
+import heapq
+import itertools
+import json
+import logging
+import subprocess
+import threading
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from TaskManager.taskManager import *
+from TaskStorePool.taskStorePool import *
+
+logger = logging.getLogger(__name__)
+
+class ConsoleNotifier:
+    """Обработчик напоминаний, выводящий уведомление в консоль."""
+    def __call__(self, event: str, task: Task, when: datetime):
+        """Печатает уведомление о наступлении срока или просрочке задачи.
+
+        :param event: Тип события ("due" или "overdue").
+        :param task: Задача, для которой наступило событие.
+        :param when: Момент, на который было запланировано событие.
+        """
+        if event == "due":
+            print(f"\nНапоминание: сегодня срок задачи '{task.title}' (ID: {task.id})")
+        else:
+            print(f"\nНапоминание: задача '{task.title}' просрочена (срок: {task.due_date}, ID: {task.id})")
+
+class HookCommandNotifier:
+    """Обработчик напоминаний, запускающий внешнюю команду."""
+    def __init__(self, command: List[str], timeout: float = 10):
+        """Инициализация обработчика командой для запуска.
+
+        :param command: Команда и ее аргументы. К ним добавляются тип события и ID задачи,
+            а данные задачи передаются в stdin в формате JSON.
+        :param timeout: Максимальное время выполнения команды в секундах.
+        """
+        self.command = command
+        self.timeout = timeout
+
+    def __call__(self, event: str, task: Task, when: datetime):
+        """Запускает команду для события задачи.
+
+        Ошибки запуска и превышение времени выполнения записываются в журнал и не прерывают работу планировщика.
+        """
+        try:
+            subprocess.run(
+                self.command + [event, task.id],
+                input=json.dumps(task.to_dict(), ensure_ascii=False),
+                text=True,
+                check=False,
+                timeout=self.timeout
+            )
+        except (OSError, subprocess.TimeoutExpired) as e:
+            logger.error("Не удалось выполнить команду напоминания %s: %s", self.command, e)
+
+class JsonlEventNotifier:
+    """Обработчик напоминаний, дописывающий события в файл JSONL."""
+    def __init__(self, path: str):
+        """Инициализация обработчика путем к файлу событий.
+
+        :param path: Файл, в который дописывается по одной JSON-строке на событие.
+        """
+        self.path = path
+
+    def __call__(self, event: str, task: Task, when: datetime):
+        """Дописывает событие задачи в файл."""
+        record = {"event": event, "at": when.isoformat(), "task": task.to_dict()}
+        with open(self.path, "a") as file:
+            file.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+class ReminderScheduler:
+    """
+    Планировщик напоминаний о сроках выполнения задач.
+
+    Невыполненные задачи хранятся в куче, упорядоченной по моменту наступления события:
+    "due" — начало дня срока выполнения, "overdue" — начало следующего дня. Планировщик подписан
+    на изменения в менеджере задач и обновляет кучу при добавлении, редактировании, выполнении
+    и удалении задач. Устаревшие записи не удаляются из кучи сразу, а пропускаются при извлечении,
+    поэтому каждое изменение и каждое срабатывание стоит O(log n). Когда устаревших записей становится
+    больше, чем действующих, куча перестраивается, так что ее размер остается пропорционален числу задач. Изменения, не затрагивающие срок
+    и статус задачи, расписание не меняют, а уже сработавшие события для того же срока не повторяются.
+
+    Атрибуты:
+        manager (TaskManager): Менеджер задач, за которыми следит планировщик.
+        handlers (List[Callable[[str, Task, datetime], None]]): Обработчики срабатывающих событий.
+        clock (Callable[[], datetime]): Источник текущего времени.
+
+    Методы:
+        schedule(task: Task, removed: bool = False): Обновляет расписание для задачи.
+        next_wakeup() -> Optional[datetime]: Возвращает момент ближайшего события.
+        run_pending() -> int: Выполняет все наступившие события.
+        start(): Запускает планировщик в фоновом потоке.
+        stop(): Останавливает фоновый поток.
+        close(): Останавливает планировщик и отписывает его от менеджера задач.
+    """
+
+    def __init__(self, manager: TaskManager, handlers: List[Callable[[str, Task, datetime], None]],
+                 clock: Callable[[], datetime] = datetime.now):
+        """
+        Инициализирует планировщик и ставит в расписание все невыполненные задачи менеджера.
+
+        Аргументы:
+            manager (TaskManager): Менеджер задач.
+            handlers (List[Callable[[str, Task, datetime], None]]): Обработчики событий.
+            clock (Callable[[], datetime]): Источник текущего времени (по умолчанию datetime.now).
+        """
+        self.manager = manager
+        self.handlers = handlers
+        self.clock = clock
+        self._heap: List[Tuple[datetime, int, str, str]] = []
+        self._versions: Dict[str, int] = {}
+        self._live: Dict[str, int] = {}
+        self._stale = 0
+        self._tasks: Dict[str, Task] = {}
+        self._due: Dict[str, datetime] = {}
+        self._fired: Dict[str, Tuple[datetime, Set[str]]] = {}
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+        for task in manager.view_tasks():
+            self.schedule(task)
+        manager.subscribe(self.schedule)
+
+    def schedule(self, task: Task, removed: bool = False):
+        """
+        Обновляет расписание для задачи. Если срок и статус задачи не изменились, расписание остается прежним.
+        Иначе прежние события задачи становятся недействительными.
+
+        Выполненные, удаленные задачи и задачи с некорректным сроком из расписания исключаются.
+        Если просрочка уже наступила, планируется только событие "overdue". События, которые уже
+        сработали для того же срока, повторно не планируются.
+
+        Аргументы:
+            task (Task): Задача, которая была добавлена или изменена.
+            removed (bool): True, если задача была удалена.
+        """
+        due = None
+        if not removed and task.status != "выполнена":
+            try:
+                due = datetime.strptime(task.due_date, "%Y-%m-%d")
+            except (TypeError, ValueError):
+                pass
+        with self._condition:
+            if removed:
+                self._fired.pop(task.id, None)
+            if due is not None and self._due.get(task.id) == due:
+                self._tasks[task.id] = task
+                return
+            self._invalidate(task.id)
+            self._tasks.pop(task.id, None)
+            self._due.pop(task.id, None)
+            if due is None:
+                return
+            fired_due, fired = self._fired.get(task.id, (None, set()))
+            if fired_due != due:
+                fired = set()
+            self._fired[task.id] = (due, fired)
+            overdue = due + timedelta(days=1)
+            version = next(self._counter)
+            self._versions[task.id] = version
+            self._tasks[task.id] = task
+            self._due[task.id] = due
+            entries = []
+            if "due" not in fired and self.clock() < overdue:
+                entries.append((due, version, "due", task.id))
+            if "overdue" not in fired:
+                entries.append((overdue, version, "overdue", task.id))
+            for entry in entries:
+                heapq.heappush(self._heap, entry)
+            self._live[task.id] = len(entries)
+            self._compact()
+            self._condition.notify()
+
+    def _invalidate(self, task_id: str):
+        """
+        Делает недействительными записи задачи в куче и учитывает их как устаревшие.
+        """
+        self._versions.pop(task_id, None)
+        self._stale += self._live.pop(task_id, 0)
+
+    def _compact(self):
+        """
+        Перестраивает кучу из действующих записей, если устаревших записей стало больше, чем действующих.
+        """
+        if self._stale > len(self._heap) - self._stale:
+            self._heap = [entry for entry in self._heap if self._versions.get(entry[3]) == entry[1]]
+            heapq.heapify(self._heap)
+            self._stale = 0
+
+    def _discard_stale(self):
+        """
+        Убирает с вершины кучи записи, относящиеся к устаревшим версиям задач.
+        """
+        while self._heap and self._versions.get(self._heap[0][3]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+            self._stale -= 1
+
+    def next_wakeup(self) -> Optional[datetime]:
+        """
+        Возвращает момент ближайшего запланированного события.
+
+        Возвращает:
+            Optional[datetime]: Момент события или None, если событий нет.
+        """
+        with self._condition:
+            self._discard_stale()
+            return self._heap[0][0] if self._heap else None
+
+    def run_pending(self) -> int:
+        """
+        Выполняет все события, момент которых уже наступил.
+
+        Исключения обработчиков записываются в журнал и не мешают остальным обработчикам и событиям.
+
+        Возвращает:
+            int: Количество сработавших событий.
+        """
+        fired = []
+        with self._condition:
+            now = self.clock()
+            self._discard_stale()
+            while self._heap and self._heap[0][0] <= now:
+                when, version, event, task_id = heapq.heappop(self._heap)
+                self._live[task_id] -= 1
+                self._fired[task_id][1].add(event)
+                fired.append((event, self._tasks[task_id], when))
+                self._discard_stale()
+        for event, task, when in fired:
+            for handler in self.handlers:
+                try:
+                    handler(event, task, when)
+                except Exception:
+                    logger.exception("Ошибка обработчика напоминания для задачи %s", task.id)
+        return len(fired)
+
+    def _run(self):
+        """
+        Основной цикл фонового потока: ждет ближайшего события или изменения расписания.
+        """
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                wakeup = self.next_wakeup()
+                timeout = None if wakeup is None else max((wakeup - self.clock()).total_seconds(), 0)
+                if timeout is None or timeout > 0:
+                    self._condition.wait(timeout)
+                if self._stopped:
+                    return
+            self.run_pending()
+
+    def start(self):
+        """
+        Запускает планировщик в фоновом потоке-демоне.
+        """
+        self._stopped = False
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """
+        Останавливает фоновый поток и дожидается его завершения.
+        """
+        with self._condition:
+            self._stopped = True
+            self._condition.notify()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+    def close(self):
+        """
+        Останавливает планировщик и отписывает его от изменений в менеджере задач.
+        """
+        self.stop()
+        self.manager.unsubscribe(self.schedule)
+
+class PooledReminders:
+    """
+    Планировщики напоминаний для хранилищ из пула: по одному на каждое открытое хранилище.
+
+    В фоновом потоке работает только планировщик активного хранилища. Планировщики неактивных
+    хранилищ остаются подписанными на изменения, поэтому при возврате к хранилищу из пула
+    уже отправленные напоминания не повторяются. Планировщики хранилищ, вытесненных из пула
+    или перечитанных с диска, закрываются.
+
+    Атрибуты:
+        pool (TaskStorePool): Пул хранилищ задач.
+        handlers (List[Callable[[str, Task, datetime], None]]): Обработчики событий.
+        clock (Callable[[], datetime]): Источник текущего времени.
+        schedulers (Dict[str, ReminderScheduler]): Планировщики по ключам хранилищ пула.
+
+    Методы:
+        activate(manager: TaskManager): Делает активным планировщик указанного хранилища.
+        close(): Закрывает все планировщики.
+    """
+
+    def __init__(self, pool: TaskStorePool, handlers: List[Callable[[str, Task, datetime], None]],
+                 clock: Callable[[], datetime] = datetime.now):
+        """
+        Инициализирует набор планировщиков для пула хранилищ.
+
+        Аргументы:
+            pool (TaskStorePool): Пул хранилищ задач.
+            handlers (List[Callable[[str, Task, datetime], None]]): Обработчики событий.
+            clock (Callable[[], datetime]): Источник текущего времени (по умолчанию datetime.now).
+        """
+        self.pool = pool
+        self.handlers = handlers
+        self.clock = clock
+        self.schedulers: Dict[str, ReminderScheduler] = {}
+        self._active: Optional[ReminderScheduler] = None
+
+    def activate(self, manager: TaskManager):
+        """
+        Останавливает планировщик прежнего хранилища и запускает планировщик указанного,
+        создавая его, если хранилища еще нет среди открытых.
+
+        Аргументы:
+            manager (TaskManager): Новое активное хранилище.
+        """
+        if self._active:
+            self._active.stop()
+        for key, scheduler in list(self.schedulers.items()):
+            if self.pool.stores.get(key) is not scheduler.manager:
+                scheduler.close()
+                del self.schedulers[key]
+        key = self.pool.key(manager.storage_file)
+        scheduler = self.schedulers.get(key)
+        if scheduler is None or scheduler.manager is not manager:
+            if scheduler:
+                scheduler.close()
+            scheduler = ReminderScheduler(manager, self.handlers, self.clock)
+            self.schedulers[key] = scheduler
+        scheduler.start()
+        self._active = scheduler
+
+    def close(self):
+        """
+        Останавливает и закрывает все планировщики.
+        """
+        for scheduler in self.schedulers.values():
+            scheduler.close()
+        self.schedulers.clear()
+        self._active = None
@@ -7,19 +7,46 @@ class TaskCLI:
 
     Атрибуты:
         manager (TaskManager): Экземпляр менеджера задач, который управляет списком задач.
+        pool (TaskStorePool): Пул открытых хранилищ задач для переключения между файлами.
+        on_switch (Optional[Callable[[TaskManager], None]]): Функция, вызываемая при смене хранилища.
         commands (dict): Словарь, содержащий команды для выполнения различных операций с задачами.
 
     Методы:
-        __init__(self, manager: TaskManager): Инициализирует CLI с менеджером задач.
+        __init__(self, manager: TaskManager, pool: Optional[TaskStorePool] = None, on_switch=None):
+            Инициализирует CLI с менеджером задач.
+        set_manager(self, manager: TaskManager): Делает менеджер задач активным.
         run(self): Запускает основной цикл взаимодействия с пользователем, обрабатывает команды.
     """
 
-    def __init__(self, manager: TaskManager):
+    def __init__(self, manager: TaskManager, pool: Optional[TaskStorePool] = None,
+                 on_switch: Optional[Callable[[TaskManager], None]] = None):
         """
         Инициализирует CLI с менеджером задач.
 
         Аргументы:
             manager (TaskManager): Экземпляр менеджера задач для управления списком задач.
+            pool (Optional[TaskStorePool]): Пул хранилищ. По умолчанию создается новый пул.
+            on_switch (Optional[Callable[[TaskManager], None]]): Функция, вызываемая при смене хранилища.
+        """
+        self.pool = pool or TaskStorePool()
+        self.pool.attach(manager)
+        self.on_switch = on_switch
+        self._build_commands(manager)
+
+    def set_manager(self, manager: TaskManager):
+        """
+        Делает менеджер задач активным для всех команд.
+
+        Аргументы:
+            manager (TaskManager): Новый активный менеджер задач.
+        """
+        self._build_commands(manager)
+        if self.on_switch:
+            self.on_switch(manager)
+
+    def _build_commands(self, manager: TaskManager):
+        """
+        Создает команды для указанного менеджера задач.
         """
         self.manager = manager
         self.commands = {
@@ -30,7 +57,9 @@ class TaskCLI:
             "5": EditTaskCommand(manager),
             "6": DeleteTaskCommand(manager),
             "7": SearchTasksCommand(manager),
-            "8": ExitCommand()
+            "8": ExitCommand(self.pool),
+            "9": StatsCommand(manager),
+            "10": SwitchStoreCommand(self.pool, self.set_manager)
         }
 
     def run(self):
@@ -56,6 +85,8 @@ class TaskCLI:
             print("6. Удаление задачи")
             print("7. Поиск задач")
             print("8. Выход")
+            print("9. Статистика")
+            print("10. Сменить хранилище")
 
             choice = input("Выберите действие: ").strip()
             command = self.commands.get(choice)
@@ -1,7 +1,15 @@
+import bisect
 import json
-from typing import List, Optional
+import os
+from collections import Counter
+from datetime import date
+from typing import Callable, Dict, List, Optional, Tuple
 from Task.task import *
 
+DUPLICATE_POLICIES = {"reject", "merge", "allow"}
+PRIORITY_ORDER = {"низкий": 0, "средний": 1, "высокий": 2}
+EDITABLE_FIELDS = {"title", "description", "category", "due_date", "priority", "status"}
+
 class TaskManager:
     """
     Класс для управления задачами, включая загрузку, сохранение, добавление, просмотр,
@@ -10,27 +18,243 @@ class TaskManager:
     Атрибуты:
         storage_file (str): Имя файла для хранения задач в формате JSON.
         tasks (List[Task]): Список задач, загруженных из файла.
+        duplicate_policy (str): Политика обработки дубликатов ("reject", "merge" или "allow").
+        listeners (List[Callable[[Task, bool], None]]): Подписчики, уведомляемые об изменении задач.
+        autosave (bool): Сохранять ли файл после каждого изменения.
+        dirty (bool): Есть ли несохраненные изменения.
+        mtime (Optional[int]): Время изменения файла (в наносекундах) при последней загрузке или сохранении.
+        size (int): Размер файла в байтах при последней загрузке или сохранении.
 
     Методы:
         load_tasks(): Загружает задачи из файла в список.
         save_tasks(): Сохраняет список задач в файл.
-        add_task(task: Task): Добавляет новую задачу в список.
+        add_task(task: Task, policy: Optional[str] = None): Добавляет новую задачу в список с проверкой на дубликаты.
+        import_tasks(tasks: List[Task], policy: Optional[str] = None): Добавляет несколько задач за одно сохранение.
+        find_duplicates(): Возвращает группы задач с одинаковым содержимым.
+        stats(today: Optional[str] = None) -> dict: Возвращает сводную статистику по задачам.
+        check_stats() -> bool: Сверяет счетчики статистики с полным пересчетом.
+        subscribe(listener): Подписывает обработчик на изменения задач.
+        unsubscribe(listener): Отписывает обработчик от изменений задач.
         view_tasks(category: Optional[str] = None): Просматривает все задачи или задачи по категории.
         search_tasks(keyword: str): Ищет задачи по ключевому слову (в названии, описании или категории).
         get_task_by_id(task_id: str) -> Optional[Task]: Возвращает задачу по уникальному ID.
         mark_completed(task_id: str): Помечает задачу как выполненную.
+        update_task(task_id: str, **fields): Изменяет поля задачи.
         delete_task(task_id: Optional[str] = None, category: Optional[str] = None): Удаляет задачу по ID или категории.
     """
 
-    def __init__(self, storage_file: str = "tasks.json"):
+    def __init__(self, storage_file: str = "tasks.json", duplicate_policy: str = "allow", autosave: bool = True):
         """
         Инициализирует менеджер задач с указанием файла для хранения данных.
 
         Аргументы:
             storage_file (str): Имя файла для хранения задач (по умолчанию "tasks.json").
+            duplicate_policy (str): Политика обработки дубликатов по умолчанию (по умолчанию "allow").
+            autosave (bool): Сохранять ли файл после каждого изменения (по умолчанию True).
+                Если False, изменения сохраняются только явным вызовом save_tasks().
         """
         self.storage_file = storage_file
+        self.duplicate_policy = self._check_policy(duplicate_policy)
+        self.listeners: List[Callable[[Task, bool], None]] = []
+        self.autosave = autosave
+        self.dirty = False
+        self.mtime: Optional[int] = None
+        self.size = 0
         self.tasks = self.load_tasks()
+        self._rebuild_index()
+
+    def subscribe(self, listener: Callable[[Task, bool], None]):
+        """
+        Подписывает обработчик на изменения задач.
+
+        Обработчик вызывается с задачей и флагом removed после добавления, редактирования,
+        выполнения (removed=False) или удаления (removed=True) задачи.
+
+        Аргументы:
+            listener (Callable[[Task, bool], None]): Обработчик изменений.
+        """
+        self.listeners.append(listener)
+
+    def unsubscribe(self, listener: Callable[[Task, bool], None]):
+        """
+        Отписывает обработчик от изменений задач.
+
+        Аргументы:
+            listener (Callable[[Task, bool], None]): Ранее подписанный обработчик.
+        """
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+
+    def _notify(self, task: Task, removed: bool = False):
+        """
+        Уведомляет подписчиков об изменении задачи.
+        """
+        for listener in self.listeners:
+            listener(task, removed)
+
+    @staticmethod
+    def fingerprint(task: Task) -> Tuple[str, str, str, str]:
+        """
+        Вычисляет нормализованный отпечаток содержимого задачи.
+
+        Учитываются название, описание, категория и срок выполнения. Регистр и лишние пробелы
+        не влияют на результат.
+
+        Аргументы:
+            task (Task): Задача, для которой вычисляется отпечаток.
+
+        Возвращает:
+            Tuple[str, str, str, str]: Отпечаток, пригодный для использования как ключ словаря.
+        """
+        return tuple(
+            " ".join(str(value).split()).lower()
+            for value in (task.title, task.description, task.category, task.due_date)
+        )
+
+    @staticmethod
+    def _check_policy(policy: str) -> str:
+        """
+        Проверяет, что политика обработки дубликатов допустима.
+
+        Возбуждает ValueError, если политика неизвестна.
+        """
+        if policy not in DUPLICATE_POLICIES:
+            raise ValueError(f"Неизвестная политика дубликатов: {policy}")
+        return policy
+
+    def _rebuild_index(self):
+        """
+        Полностью перестраивает индекс отпечатков и счетчики статистики по текущему списку задач.
+        """
+        self._index: Dict[Tuple[str, str, str, str], List[Task]] = {}
+        self._counters = self._count_tasks([])
+        self._open_dates: List[str] = []
+        self._overdue_day = ""
+        self._overdue = 0
+        for task in self.tasks:
+            self._index_task(task)
+
+    def _track_open_date(self, task: Task, delta: int):
+        """
+        Обновляет отсортированный список сроков невыполненных задач и счетчик просроченных задач.
+
+        Вызывается после изменения счетчика "due_date" для невыполненной задачи. Счетчик просроченных
+        задач считается относительно даты _overdue_day.
+        """
+        if task.status == "выполнена":
+            return
+        due_date = task.due_date
+        if due_date < self._overdue_day:
+            self._overdue += delta
+        count = self._counters["due_date"][due_date]
+        if delta > 0 and count == delta:
+            bisect.insort(self._open_dates, due_date)
+        elif delta < 0 and count == 0:
+            del self._open_dates[bisect.bisect_left(self._open_dates, due_date)]
+
+    def _advance_overdue(self, today: str) -> int:
+        """
+        Сдвигает дату отсчета просроченных задач на today и возвращает их число.
+
+        При движении вперед учитываются только сроки между прежней и новой датой, поэтому при ежедневном
+        обновлении стоимость вызова пропорциональна числу сроков, ставших просроченными. При движении
+        назад счетчик пересчитывается по сокращенному списку сроков.
+        """
+        if today < self._overdue_day:
+            self._overdue_day, self._overdue = "", 0
+        start = bisect.bisect_left(self._open_dates, self._overdue_day)
+        end = bisect.bisect_left(self._open_dates, today, lo=start)
+        self._overdue += sum(self._counters["due_date"][due_date] for due_date in self._open_dates[start:end])
+        self._overdue_day = today
+        return self._overdue
+
+    @staticmethod
+    def _count_tasks(tasks: List[Task], delta: int = 1, counters: Optional[Dict[str, Counter]] = None) -> Dict[str, Counter]:
+        """
+        Прибавляет задачи к счетчикам статистики (или вычитает при delta=-1).
+
+        Счетчик "due_date" учитывает только невыполненные задачи и используется для подсчета просроченных.
+
+        Возвращает:
+            Dict[str, Counter]: Обновленные счетчики.
+        """
+        if counters is None:
+            counters = {name: Counter() for name in ("category", "priority", "status", "due_date")}
+        for task in tasks:
+            keys = {"category": task.category, "priority": task.priority, "status": task.status}
+            if task.status != "выполнена":
+                keys["due_date"] = task.due_date
+            for name, key in keys.items():
+                counters[name][key] += delta
+                if counters[name][key] <= 0:
+                    del counters[name][key]
+        return counters
+
+    def _index_task(self, task: Task):
+        """
+        Добавляет задачу в индекс отпечатков и счетчики статистики.
+        """
+        self._index.setdefault(self.fingerprint(task), []).append(task)
+        self._count_tasks([task], 1, self._counters)
+        self._track_open_date(task, 1)
+
+    def _unindex_task(self, task: Task):
+        """
+        Удаляет задачу из индекса отпечатков и счетчиков статистики.
+        """
+        self._count_tasks([task], -1, self._counters)
+        self._track_open_date(task, -1)
+        key = self.fingerprint(task)
+        group = self._index.get(key, [])
+        if task in group:
+            group.remove(task)
+        if not group:
+            self._index.pop(key, None)
+
+    def find_duplicate(self, task: Task) -> Optional[Task]:
+        """
+        Возвращает уже сохраненную задачу с тем же содержимым, что и переданная.
+
+        Аргументы:
+            task (Task): Задача для проверки.
+
+        Возвращает:
+            Optional[Task]: Первая задача с таким же отпечатком или None.
+        """
+        group = self._index.get(self.fingerprint(task))
+        return group[0] if group else None
+
+    def _merge(self, existing: Task, task: Task):
+        """
+        Объединяет новую задачу с существующей: сохраняется более высокий приоритет,
+        а выполненный статус имеет преимущество.
+        """
+        if PRIORITY_ORDER.get(task.priority, -1) > PRIORITY_ORDER.get(existing.priority, -1):
+            existing.priority = task.priority
+        if task.status == "выполнена":
+            existing.status = task.status
+
+    def _insert(self, task: Task, policy: str) -> Optional[Task]:
+        """
+        Добавляет задачу в список и индекс с учетом политики дубликатов, не сохраняя файл.
+
+        Возвращает:
+            Optional[Task]: Задача, оказавшаяся в хранилище, или None, если дубликат отклонен.
+        """
+        if policy != "allow":
+            existing = self.find_duplicate(task)
+            if existing:
+                if policy == "reject":
+                    return None
+                self._unindex_task(existing)
+                self._merge(existing, task)
+                self._index_task(existing)
+                self._notify(existing)
+                return existing
+        self.tasks.append(task)
+        self._index_task(task)
+        self._notify(task)
+        return task
 
     def load_tasks(self) -> List[Task]:
         """
@@ -38,11 +262,21 @@ class TaskManager:
 
         Возвращает:
             List[Task]: Список задач, загруженных из файла. Если файл не найден, возвращается пустой список.
+
+        Возбуждает ValueError, если файл не содержит список задач.
         """
         try:
             with open(self.storage_file, "r") as file:
-                return [Task.from_dict(task) for task in json.load(file)]
+                self._record_stat(os.fstat(file.fileno()))
+                data = json.load(file)
+                if not isinstance(data, list) or not all(
+                    isinstance(task, dict) and all(isinstance(task.get(field), str) for field in EDITABLE_FIELDS)
+                    for task in data
+                ):
+                    raise ValueError(f"Файл {self.storage_file} не содержит список задач")
+                return [Task.from_dict(task) for task in data]
         except FileNotFoundError:
+            self.mtime, self.size = None, 0
             return []
 
     def save_tasks(self):
@@ -53,16 +287,116 @@ class TaskManager:
         """
         with open(self.storage_file, "w") as file:
             json.dump([task.to_dict() for task in self.tasks], file, indent=4)
+            file.flush()
+            self._record_stat(os.fstat(file.fileno()))
+        self.dirty = False
+
+    def _record_stat(self, stat: os.stat_result):
+        """
+        Запоминает время изменения и размер файла хранилища.
+        """
+        self.mtime, self.size = stat.st_mtime_ns, stat.st_size
 
-    def add_task(self, task: Task):
+    def _commit(self):
+        """
+        Отмечает наличие несохраненных изменений и сохраняет их, если включено автосохранение.
+        """
+        self.dirty = True
+        if self.autosave:
+            self.save_tasks()
+
+    def add_task(self, task: Task, policy: Optional[str] = None) -> Task:
         """
         Добавляет новую задачу в список и сохраняет изменения.
 
         Аргументы:
             task (Task): Задача, которую нужно добавить.
+            policy (Optional[str]): Политика обработки дубликатов. По умолчанию используется политика менеджера.
+
+        Возвращает:
+            Task: Добавленная задача или существующая задача, с которой была объединена новая.
+
+        Возбуждает ValueError, если задача является дубликатом и политика "reject".
         """
-        self.tasks.append(task)
-        self.save_tasks()
+        policy = self._check_policy(policy or self.duplicate_policy)
+        stored = self._insert(task, policy)
+        if stored is None:
+            raise ValueError("Такая задача уже существует")
+        self._commit()
+        return stored
+
+    def import_tasks(self, tasks: List[Task], policy: Optional[str] = None) -> List[Task]:
+        """
+        Добавляет несколько задач и сохраняет изменения один раз.
+
+        Дубликаты проверяются как среди уже сохраненных задач, так и внутри импортируемого списка.
+        При политике "reject" дубликаты пропускаются.
+
+        Аргументы:
+            tasks (List[Task]): Задачи для импорта.
+            policy (Optional[str]): Политика обработки дубликатов. По умолчанию используется политика менеджера.
+
+        Возвращает:
+            List[Task]: Задачи, которые были добавлены как новые.
+        """
+        policy = self._check_policy(policy or self.duplicate_policy)
+        added = []
+        for task in tasks:
+            if self._insert(task, policy) is task:
+                added.append(task)
+        self._commit()
+        return added
+
+    def find_duplicates(self) -> List[List[Task]]:
+        """
+        Находит группы задач с одинаковым содержимым по индексу отпечатков за один проход.
+
+        Возвращает:
+            List[List[Task]]: Группы из двух и более задач с одинаковым отпечатком.
+        """
+        return [list(group) for group in self._index.values() if len(group) > 1]
+
+    def stats(self, today: Optional[str] = None) -> dict:
+        """
+        Возвращает сводную статистику по задачам без обхода всего списка.
+
+        Счетчики обновляются при каждом изменении задач, поэтому стоимость вызова зависит от числа
+        различных категорий, приоритетов и статусов. Число просроченных задач поддерживается отдельно
+        и при переходе на следующий день дополняется только сроками, которые стали просроченными.
+
+        Аргументы:
+            today (Optional[str]): Текущая дата в формате "YYYY-MM-DD". По умолчанию сегодняшняя дата.
+
+        Возвращает:
+            dict: Общее число задач, счетчики по категориям, приоритетам и статусам,
+                число просроченных задач и доля выполненных задач.
+        """
+        today = today or date.today().isoformat()
+        total = len(self.tasks)
+        completed = self._counters["status"]["выполнена"]
+        return {
+            "total": total,
+            "by_category": dict(self._counters["category"]),
+            "by_priority": dict(self._counters["priority"]),
+            "by_status": dict(self._counters["status"]),
+            "overdue": self._advance_overdue(today),
+            "completion_rate": completed / total if total else 0.0
+        }
+
+    def check_stats(self) -> bool:
+        """
+        Пересчитывает статистику с нуля и сравнивает ее с поддерживаемыми счетчиками.
+
+        Возвращает:
+            bool: True, если счетчики согласованы со списком задач, иначе False.
+        """
+        counters = self._count_tasks(self.tasks)
+        overdue = sum(count for due_date, count in counters["due_date"].items() if due_date < self._overdue_day)
+        return (
+            counters == self._counters and
+            self._open_dates == sorted(counters["due_date"]) and
+            overdue == self._overdue
+        )
 
     def view_tasks(self, category: Optional[str] = None) -> List[Task]:
         """
@@ -124,11 +458,41 @@ class TaskManager:
         """
         for task in self.tasks:
             if task.id == task_id:
+                self._unindex_task(task)
                 task.status = "выполнена"
-                self.save_tasks()
+                self._index_task(task)
+                self._notify(task)
+                self._commit()
                 return True
         return False
 
+    def update_task(self, task_id: str, **fields) -> bool:
+        """
+        Изменяет поля задачи по ее уникальному ID и сохраняет изменения.
+
+        Аргументы:
+            task_id (str): Уникальный идентификатор задачи.
+            **fields: Новые значения полей (title, description, category, due_date, priority, status).
+
+        Возвращает:
+            bool: True, если задача была изменена, иначе False.
+
+        Возбуждает ValueError, если передано поле, которое нельзя изменять.
+        """
+        unknown = set(fields) - EDITABLE_FIELDS
+        if unknown:
+            raise ValueError(f"Недопустимые поля задачи: {', '.join(sorted(unknown))}")
+        task = self.get_task_by_id(task_id)
+        if not task:
+            return False
+        self._unindex_task(task)
+        for name, value in fields.items():
+            setattr(task, name, value)
+        self._index_task(task)
+        self._notify(task)
+        self._commit()
+        return True
+
     def delete_task(self, task_id: Optional[str] = None, category: Optional[str] = None):
         """
         Удаляет задачу по ID или по категории.
@@ -137,8 +501,14 @@ class TaskManager:
             task_id (Optional[str]): Уникальный идентификатор задачи для удаления.
             category (Optional[str]): Категория, по которой нужно удалять задачи. Если указана категория, удаляются все задачи из этой категории.
         """
+        removed = []
         if task_id:
+            removed = [task for task in self.tasks if task.id == task_id]
             self.tasks = [task for task in self.tasks if task.id != task_id]
         elif category:
+            removed = [task for task in self.tasks if task.category == category]
             self.tasks = [task for task in self.tasks if task.category != category]
-        self.save_tasks()
+        for task in removed:
+            self._unindex_task(task)
+            self._notify(task, removed=True)
+        self._commit()
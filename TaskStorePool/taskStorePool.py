@@ -0,0 +1,165 @@
+import logging
+import os
+from collections import OrderedDict
+from TaskManager.taskManager import *
+
+AVERAGE_TASK_SIZE = 512
+
+logger = logging.getLogger(__name__)
+
+class TaskStorePool:
+    """
+    Пул открытых хранилищ задач. Позволяет переключаться между несколькими файлами задач,
+    не перечитывая их при каждом переключении.
+
+    Менеджеры задач хранятся в порядке последнего использования. Когда суммарный размер
+    открытых хранилищ превышает бюджет памяти, вытесняются давно не использованные хранилища;
+    несохраненные изменения перед вытеснением записываются в файл. Размер хранилища оценивается
+    по размеру его файла, но не меньше чем AVERAGE_TASK_SIZE байт на задачу. Перед выдачей хранилища из пула сверяется время изменения файла:
+    если файл был изменен извне, хранилище загружается заново.
+
+    Атрибуты:
+        memory_budget (int): Бюджет памяти в байтах для открытых хранилищ.
+        autosave (bool): Режим автосохранения для создаваемых менеджеров задач.
+        stores (OrderedDict[str, TaskManager]): Открытые хранилища по путям к файлам.
+
+    Методы:
+        key(storage_file: str) -> str: Возвращает ключ хранилища в пуле.
+        get(storage_file: str) -> TaskManager: Возвращает хранилище, открывая его при необходимости.
+        attach(manager: TaskManager): Добавляет в пул уже открытый менеджер задач.
+        memory_usage() -> int: Возвращает оценку памяти, занятой открытыми хранилищами.
+        flush(): Сохраняет все хранилища с несохраненными изменениями.
+        close(): Сохраняет изменения и закрывает все хранилища.
+    """
+
+    def __init__(self, memory_budget: int = 64 * 1024 * 1024, autosave: bool = True):
+        """
+        Инициализирует пустой пул хранилищ.
+
+        Аргументы:
+            memory_budget (int): Бюджет памяти в байтах (по умолчанию 64 МБ).
+            autosave (bool): Режим автосохранения для создаваемых менеджеров задач (по умолчанию True).
+        """
+        self.memory_budget = memory_budget
+        self.autosave = autosave
+        self.stores: "OrderedDict[str, TaskManager]" = OrderedDict()
+
+    @staticmethod
+    def key(storage_file: str) -> str:
+        """
+        Приводит путь к файлу к виду, используемому как ключ хранилища в пуле.
+        """
+        return os.path.abspath(storage_file)
+
+    @staticmethod
+    def _is_fresh(manager: TaskManager) -> bool:
+        """
+        Проверяет по времени изменения и размеру, что файл хранилища не изменялся с момента
+        последней загрузки или сохранения.
+        """
+        try:
+            stat = os.stat(manager.storage_file)
+        except FileNotFoundError:
+            return manager.mtime is None
+        return (stat.st_mtime_ns, stat.st_size) == (manager.mtime, manager.size)
+
+    def get(self, storage_file: str) -> TaskManager:
+        """
+        Возвращает менеджер задач для файла, используя открытое хранилище, если оно актуально.
+
+        Аргументы:
+            storage_file (str): Путь к файлу задач.
+
+        Возвращает:
+            TaskManager: Менеджер задач для указанного файла.
+
+        Возбуждает ValueError, если у открытого хранилища есть несохраненные изменения, а файл был изменен
+        извне: сохранение такого хранилища затерло бы внешние изменения.
+        """
+        key = self.key(storage_file)
+        manager = self.stores.get(key)
+        if manager is not None and not self._is_fresh(manager):
+            if manager.dirty:
+                raise ValueError(f"Файл {storage_file} изменен извне, а в хранилище есть несохраненные изменения")
+            manager = None
+        if manager is None:
+            manager = TaskManager(storage_file, autosave=self.autosave)
+        self.stores[key] = manager
+        self.stores.move_to_end(key)
+        self._evict()
+        return manager
+
+    def attach(self, manager: TaskManager):
+        """
+        Добавляет в пул уже открытый менеджер задач как последний использованный.
+
+        Аргументы:
+            manager (TaskManager): Менеджер задач.
+        """
+        key = self.key(manager.storage_file)
+        self.stores[key] = manager
+        self.stores.move_to_end(key)
+        self._evict()
+
+    def memory_usage(self) -> int:
+        """
+        Возвращает оценку памяти, занятой открытыми хранилищами.
+
+        Возвращает:
+            int: Оценка суммарного размера открытых хранилищ в байтах.
+        """
+        return sum(max(manager.size, len(manager.tasks) * AVERAGE_TASK_SIZE) for manager in self.stores.values())
+
+    def _save(self, manager: TaskManager):
+        """
+        Сохраняет несохраненные изменения хранилища, если его файл не изменялся извне.
+
+        Возбуждает ValueError, если файл был изменен извне: сохранение затерло бы внешние изменения.
+        """
+        if not manager.dirty:
+            return
+        if not self._is_fresh(manager):
+            raise ValueError(f"Файл {manager.storage_file} изменен извне, а в хранилище есть несохраненные изменения")
+        manager.save_tasks()
+
+    def _evict(self):
+        """
+        Вытесняет давно не использованные хранилища, пока пул не уложится в бюджет.
+        Последнее использованное хранилище не вытесняется никогда. Хранилища, изменения которых
+        нельзя сохранить из-за внешнего изменения файла, остаются в пуле.
+        """
+        for key in list(self.stores)[:-1]:
+            if self.memory_usage() <= self.memory_budget:
+                break
+            try:
+                self._save(self.stores[key])
+            except ValueError as e:
+                logger.warning("Хранилище не вытеснено: %s", e)
+                continue
+            del self.stores[key]
+
+    def flush(self):
+        """
+        Сохраняет все хранилища с несохраненными изменениями.
+
+        Хранилища, файлы которых не изменялись извне, сохраняются в любом случае.
+        Возбуждает ValueError со списком конфликтов, если какие-то хранилища сохранить нельзя.
+        """
+        conflicts = []
+        for manager in self.stores.values():
+            try:
+                self._save(manager)
+            except ValueError as e:
+                conflicts.append(str(e))
+        if conflicts:
+            raise ValueError("; ".join(conflicts))
+
+    def close(self):
+        """
+        Сохраняет изменения и закрывает все хранилища.
+
+        Возбуждает ValueError, если изменения некоторых хранилищ нельзя сохранить; в этом случае
+        хранилища остаются открытыми.
+        """
+        self.flush()
+        self.stores.clear()
@@ -1,7 +1,11 @@
-from TaskManager.taskManager import TaskManager
+from TaskStorePool.taskStorePool import TaskStorePool
 from TaskCLI.taskCLI import TaskCLI
+from Scheduler.scheduler import PooledReminders, ConsoleNotifier
 
 if __name__ == "__main__":
-    manager = TaskManager()
-    cli = TaskCLI(manager)
+    pool = TaskStorePool()
+    manager = pool.get("tasks.json")
+    reminders = PooledReminders(pool, [ConsoleNotifier()])
+    reminders.activate(manager)
+    cli = TaskCLI(manager, pool, on_switch=reminders.activate)
     cli.run()
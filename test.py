@@ -6,11 +6,19 @@ from Command.command import (
     ViewTasksCommand,
     ViewTasksByCategoryCommand,
     CompleteTaskCommand,
-    SearchTasksCommand
+    SearchTasksCommand,
+    StatsCommand,
+    SwitchStoreCommand,
+    ExitCommand
 )
 from TaskManager.taskManager import TaskManager
+from TaskStorePool.taskStorePool import TaskStorePool
+from Scheduler.scheduler import ReminderScheduler, PooledReminders, JsonlEventNotifier, HookCommandNotifier, ConsoleNotifier
+from datetime import datetime
 from Task.task import Task
 import io
+import json
+import sys
 
 
 @pytest.fixture
@@ -176,4 +184,382 @@ def test_search_tasks_command(task_manager):
     task_manager.search_tasks.assert_called_once_with(query)
     output = mock_stdout.getvalue()
     assert "Test Task 1" in output
-    assert "Test Task 2" in output
\ No newline at end of file
+    assert "Test Task 2" in output
+
+def make_task(title="Task", description="Description", category="Category",
+              due_date="2024-12-31", priority="низкий"):
+    return Task(
+        title=title,
+        description=description,
+        category=category,
+        due_date=due_date,
+        priority=priority
+    )
+
+
+def test_add_task_duplicate_policies(tmp_path):
+    """Тест для проверки дубликатов при добавлении задачи"""
+
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    manager.add_task(make_task())
+
+    with pytest.raises(ValueError):
+        manager.add_task(make_task(title="  task "), policy="reject")
+
+    merged = manager.add_task(make_task(priority="высокий"), policy="merge")
+    assert len(manager.tasks) == 1
+    assert merged is manager.tasks[0]
+    assert merged.priority == "высокий"
+
+    manager.add_task(make_task(), policy="allow")
+    assert len(manager.tasks) == 2
+
+
+def test_import_tasks_and_find_duplicates(tmp_path):
+    """Тест для импорта задач и отчета о дубликатах"""
+
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    added = manager.import_tasks([make_task(), make_task(), make_task(title="Other")], policy="reject")
+    assert [task.title for task in added] == ["Task", "Other"]
+    assert manager.find_duplicates() == []
+
+    manager.import_tasks([make_task(title="Other")], policy="allow")
+    duplicates = manager.find_duplicates()
+    assert len(duplicates) == 1
+    assert all(task.title == "Other" for task in duplicates[0])
+
+    manager.delete_task(task_id=duplicates[0][0].id)
+    manager.update_task(added[0].id, title="Renamed")
+    assert manager.find_duplicate(make_task()) is None
+    assert manager.find_duplicate(make_task(title="renamed")) is added[0]
+
+
+def test_update_task_rejects_unknown_fields(tmp_path):
+    """Тест для запрета изменения неизвестных полей задачи"""
+
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    task = manager.add_task(make_task())
+
+    with pytest.raises(ValueError):
+        manager.update_task(task.id, titel="Typo")
+    with pytest.raises(ValueError):
+        manager.update_task(task.id, id="other-id")
+    assert task.title == "Task"
+    assert not hasattr(task, "titel")
+
+
+def test_stats_command(task_manager):
+    """Тест для команды просмотра статистики"""
+
+    task_manager.stats.return_value = {
+        "total": 2,
+        "by_category": {"Category 1": 2},
+        "by_priority": {"низкий": 1, "высокий": 1},
+        "by_status": {"выполнена": 1, "не выполнена": 1},
+        "overdue": 1,
+        "completion_rate": 0.5
+    }
+
+    command = StatsCommand(manager=task_manager)
+    with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+        command.execute()
+
+    output = mock_stdout.getvalue()
+    assert "Всего задач: 2" in output
+    assert "Category 1: 2" in output
+    assert "Просрочено: 1" in output
+    assert "Выполнено: 50%" in output
+
+
+def test_stats_counters(tmp_path):
+    """Тест для поддержки счетчиков статистики при изменениях"""
+
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    first = manager.add_task(make_task(title="First", due_date="2024-01-01"))
+    second = manager.add_task(make_task(title="Second", priority="высокий", due_date="2024-06-01"))
+    manager.add_task(make_task(title="Third", category="Other", due_date="2025-01-01"))
+
+    stats = manager.stats(today="2024-12-31")
+    assert stats["total"] == 3
+    assert stats["by_category"] == {"Category": 2, "Other": 1}
+    assert stats["overdue"] == 2
+
+    manager.mark_completed(first.id)
+    manager.update_task(second.id, due_date="2025-02-01")
+    manager.delete_task(category="Other")
+
+    stats = manager.stats(today="2024-12-31")
+    assert stats["total"] == 2
+    assert stats["by_status"] == {"выполнена": 1, "не выполнена": 1}
+    assert stats["overdue"] == 0
+    assert stats["completion_rate"] == 0.5
+    assert manager.check_stats()
+
+    assert TaskManager(manager.storage_file).stats(today="2024-12-31") == stats
+
+
+def test_stats_overdue_follows_date(tmp_path):
+    """Тест для счетчика просроченных задач при смене даты и изменениях задач"""
+
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    first = manager.add_task(make_task(title="First", due_date="2024-01-01"))
+    manager.add_task(make_task(title="Second", due_date="2024-01-03"))
+    manager.add_task(make_task(title="Third", due_date="2024-01-05"))
+
+    assert manager.stats(today="2024-01-02")["overdue"] == 1
+    manager.add_task(make_task(title="Past", due_date="2023-12-31"))
+    manager.add_task(make_task(title="Future", due_date="2024-01-04"))
+    assert manager.stats(today="2024-01-02")["overdue"] == 2
+
+    manager.mark_completed(first.id)
+    assert manager.stats(today="2024-01-05")["overdue"] == 3
+    assert manager.check_stats()
+
+    assert manager.stats(today="2024-01-02")["overdue"] == 1
+    assert manager.check_stats()
+
+
+def test_reminder_scheduler(tmp_path):
+    """Тест для планировщика напоминаний с подменой часов"""
+
+    now = [datetime(2024, 12, 30, 12, 0)]
+    events = []
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    late = manager.add_task(make_task(title="Late", due_date="2024-12-01"))
+    soon = manager.add_task(make_task(title="Soon", due_date="2024-12-31"))
+    scheduler = ReminderScheduler(manager, [lambda event, task, when: events.append((event, task.title))], clock=lambda: now[0])
+
+    assert scheduler.run_pending() == 1
+    assert events == [("overdue", "Late")]
+    assert scheduler.next_wakeup() == datetime(2024, 12, 31)
+
+    later = manager.add_task(make_task(title="Later", due_date="2024-12-31"))
+    manager.update_task(soon.id, due_date="2025-01-05")
+    manager.mark_completed(later.id)
+    now[0] = datetime(2025, 1, 2)
+    assert scheduler.run_pending() == 0
+
+    manager.delete_task(task_id=soon.id)
+    assert scheduler.next_wakeup() is None
+    assert manager.get_task_by_id(late.id) is late
+
+
+def test_reminder_scheduler_does_not_repeat_fired_events(tmp_path):
+    """Тест для отсутствия повторных напоминаний после изменений, не затрагивающих срок"""
+
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    task = manager.add_task(make_task(due_date="2024-12-01"))
+    scheduler = ReminderScheduler(manager, [], clock=lambda: datetime(2024, 12, 30))
+    assert scheduler.run_pending() == 1
+
+    manager.update_task(task.id, title="Renamed")
+    assert scheduler.run_pending() == 0
+
+    manager.add_task(make_task(title="Renamed", due_date="2024-12-01", priority="высокий"), policy="merge")
+    assert scheduler.run_pending() == 0
+
+    manager.update_task(task.id, status="выполнена")
+    manager.update_task(task.id, status="не выполнена")
+    assert scheduler.run_pending() == 0
+
+    manager.update_task(task.id, due_date="2024-12-02")
+    assert scheduler.run_pending() == 1
+
+
+def test_reminder_scheduler_compacts_stale_entries(tmp_path):
+    """Тест для ограничения размера кучи при многократной смене срока"""
+
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    task = manager.add_task(make_task(due_date="2030-01-01"))
+    manager.add_task(make_task(title="Other", due_date="2030-06-01"))
+    scheduler = ReminderScheduler(manager, [], clock=lambda: datetime(2024, 12, 30))
+
+    for day in range(1, 29):
+        manager.update_task(task.id, due_date=f"2031-02-{day:02d}")
+        assert len(scheduler._heap) <= 8
+
+    assert scheduler.next_wakeup() == datetime(2030, 6, 1)
+
+
+def test_reminder_scheduler_survives_handler_errors(tmp_path):
+    """Тест для продолжения работы планировщика при ошибках обработчиков"""
+
+    events = []
+
+    def failing_handler(event, task, when):
+        raise RuntimeError("handler failed")
+
+    manager = TaskManager(str(tmp_path / "tasks.json"))
+    manager.add_task(make_task(title="First", due_date="2024-12-01"))
+    manager.add_task(make_task(title="Second", due_date="2024-12-02"))
+    handlers = [failing_handler, HookCommandNotifier(["/nonexistent"]), lambda event, task, when: events.append(task.title)]
+    scheduler = ReminderScheduler(manager, handlers, clock=lambda: datetime(2024, 12, 30))
+
+    assert scheduler.run_pending() == 2
+    assert events == ["First", "Second"]
+
+
+def test_hook_command_notifier(tmp_path):
+    """Тест для запуска внешней команды при напоминании"""
+
+    output = tmp_path / "hook.txt"
+    script = "import sys, json; open(sys.argv[1], 'w').write(sys.argv[2] + ' ' + json.load(sys.stdin)['title'])"
+    notifier = HookCommandNotifier([sys.executable, "-c", script, str(output)])
+    notifier("overdue", make_task(), datetime(2024, 12, 31))
+
+    assert output.read_text() == "overdue Task"
+
+    HookCommandNotifier([sys.executable, "-c", "import time; time.sleep(5)"], timeout=0.1)("due", make_task(), datetime(2024, 12, 31))
+
+
+def test_console_notifier():
+    """Тест для вывода напоминаний в консоль"""
+
+    with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+        ConsoleNotifier()("overdue", make_task(), datetime(2025, 1, 1))
+
+    assert "'Task' просрочена" in mock_stdout.getvalue()
+
+
+def test_jsonl_event_notifier(tmp_path):
+    """Тест для записи событий напоминаний в файл JSONL"""
+
+    path = tmp_path / "events.jsonl"
+    notifier = JsonlEventNotifier(str(path))
+    notifier("due", make_task(), datetime(2024, 12, 31))
+
+    record = json.loads(path.read_text())
+    assert record["event"] == "due"
+    assert record["task"]["title"] == "Task"
+
+
+def test_task_store_pool_reuses_and_evicts(tmp_path):
+    """Тест для пула хранилищ: повторное использование, вытеснение и проверка mtime"""
+
+    first_file, second_file = str(tmp_path / "first.json"), str(tmp_path / "second.json")
+    pool = TaskStorePool(memory_budget=1, autosave=False)
+
+    first = pool.get(first_file)
+    first.add_task(make_task())
+    assert first.dirty
+    assert pool.get(first_file) is first
+
+    second = pool.get(second_file)
+    assert list(pool.stores.values()) == [second]
+    assert not first.dirty
+    assert [task.title for task in TaskManager(first_file).tasks] == ["Task"]
+
+    pool.memory_budget = 1024 * 1024
+    reopened = pool.get(first_file)
+    assert pool.get(first_file) is reopened
+
+    TaskManager(first_file).add_task(make_task(title="External"))
+    refreshed = pool.get(first_file)
+    assert refreshed is not reopened
+    assert len(refreshed.tasks) == 2
+
+
+def test_task_store_pool_reports_conflict_for_dirty_store(tmp_path):
+    """Тест для конфликта несохраненных изменений с внешним изменением файла"""
+
+    storage_file = str(tmp_path / "tasks.json")
+    TaskManager(storage_file).add_task(make_task())
+    pool = TaskStorePool(autosave=False)
+    manager = pool.get(storage_file)
+    manager.add_task(make_task(title="Local"))
+
+    TaskManager(storage_file).add_task(make_task(title="External"))
+    with pytest.raises(ValueError):
+        pool.get(storage_file)
+    assert [task.title for task in TaskManager(storage_file).tasks] == ["Task", "External"]
+
+
+def test_task_store_pool_does_not_overwrite_external_changes(tmp_path):
+    """Тест для вытеснения и закрытия хранилища, файл которого изменен извне"""
+
+    first_file = str(tmp_path / "first.json")
+    pool = TaskStorePool(memory_budget=1, autosave=False)
+    first = pool.get(first_file)
+    first.add_task(make_task(title="Local"))
+    TaskManager(first_file).add_task(make_task(title="External"))
+
+    pool.get(str(tmp_path / "second.json"))
+    assert pool.stores[pool.key(first_file)] is first
+
+    with pytest.raises(ValueError):
+        pool.close()
+    assert [task.title for task in TaskManager(first_file).tasks] == ["External"]
+
+    with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+        with pytest.raises(SystemExit):
+            ExitCommand(pool).execute()
+    assert "изменения не сохранены" in mock_stdout.getvalue()
+    assert [task.title for task in TaskManager(first_file).tasks] == ["External"]
+
+
+def test_exit_command_flushes_pool(tmp_path):
+    """Тест для сохранения изменений пула при выходе"""
+
+    storage_file = str(tmp_path / "tasks.json")
+    pool = TaskStorePool(autosave=False)
+    pool.get(storage_file).add_task(make_task())
+
+    with pytest.raises(SystemExit):
+        ExitCommand(pool).execute()
+
+    assert [task.title for task in TaskManager(storage_file).tasks] == ["Task"]
+
+
+def test_pooled_reminders_keep_state_between_switches(tmp_path):
+    """Тест для отсутствия повторных напоминаний при возврате к хранилищу из пула"""
+
+    events = []
+    pool = TaskStorePool()
+    first = pool.get(str(tmp_path / "first.json"))
+    first.add_task(make_task(due_date="2024-12-01"))
+    second = pool.get(str(tmp_path / "second.json"))
+    reminders = PooledReminders(pool, [lambda event, task, when: events.append(event)], clock=lambda: datetime(2024, 12, 30))
+
+    reminders.activate(first)
+    scheduler = reminders.schedulers[pool.key(first.storage_file)]
+    scheduler.run_pending()
+    reminders.activate(second)
+    reminders.activate(pool.get(first.storage_file))
+    assert reminders.schedulers[pool.key(first.storage_file)] is scheduler
+    assert scheduler.run_pending() == 0
+    reminders.close()
+
+    assert events == ["overdue"]
+    assert len(reminders.schedulers) == 0
+
+
+def test_switch_store_command_reports_malformed_file(tmp_path):
+    """Тест для команды смены хранилища с файлом неверного формата"""
+
+    switched = []
+    for index, content in enumerate(['{"a": 1}', '[1, 2]', '[{"title": "Task"}]']):
+        storage_file = tmp_path / f"bad{index}.json"
+        storage_file.write_text(content)
+
+        with patch("builtins.input", return_value=str(storage_file)):
+            command = SwitchStoreCommand(TaskStorePool(), switched.append)
+            with patch("sys.stdout", new_callable=io.StringIO) as mock_stdout:
+                command.execute()
+
+        assert "не удалось открыть хранилище" in mock_stdout.getvalue()
+    assert switched == []
+
+
+def test_switch_store_command(tmp_path):
+    """Тест для команды смены хранилища"""
+
+    pool = TaskStorePool()
+    switched = []
+    storage_file = str(tmp_path / "team.json")
+
+    with patch("builtins.input", return_value=storage_file):
+        command = SwitchStoreCommand(pool, switched.append)
+        with patch("sys.stdout", new_callable=io.StringIO):
+            command.execute()
+
+    assert switched == [pool.get(storage_file)]